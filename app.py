@@ -9,8 +9,9 @@ import os
 import io
 import time
 import logging
+from itertools import chain
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from pypdf import PdfReader
 
 # Optional Tkinter for local folder browsing
 try:
@@ -20,19 +21,13 @@ try:
 except ImportError:
     HAS_TKINTER = False
 
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-
 # Import extraction utilities
 from extraction_utils import (
     normalize_text,
-    identify_manual_name,
-    classify_doc_type,
     METADATA_PATTERNS,
     extract_with_regex
 )
+from scanner import ScanCache, iter_files, scan_cache_key, scan_one
 
 # --- Configuration & State ---
 st.set_page_config(page_title="Manual & Drawing Scanner", layout="wide")
@@ -58,29 +53,19 @@ def select_folder():
     except Exception:
         return None
 
-# --- Extraction Logic ---
-def extract_pdf_content(file_path):
-    """Extract text and metadata from the first two pages of a PDF."""
-    try:
-        reader = PdfReader(file_path)
-        pages = []
-        for i in range(min(2, len(reader.pages))):
-            text = reader.pages[i].extract_text() or ""
-            pages.append(text)
-        return "\n".join(pages), reader.metadata or {}, "Success"
-    except Exception as e:
-        return "", {}, f"Error: {str(e)}"
+def render_stats(placeholder, total_files, counts):
+    """Redraw all live counters in one batch."""
+    with placeholder.container():
+        stats_cols = st.columns(6)
+        stats_cols[0].metric("Total", total_files)
+        stats_cols[1].metric("Processed", counts["processed"])
+        stats_cols[2].metric("Success", counts["success"])
+        stats_cols[3].metric("Unsupported", counts["unsupported"])
+        stats_cols[4].metric("No Text", counts["ocr_missing"])
+        stats_cols[5].metric("Errors", counts["error"])
 
-def extract_docx_content(file_path):
-    """Extract text from the first two pages of a DOCX (approx 50 paras)."""
-    if Document is None:
-        return "", "Skipped: python-docx not installed"
-    try:
-        doc = Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs[:50]])
-        return text, "Success"
-    except Exception as e:
-        return "", f"Error: {str(e)}"
+# Minimum seconds between live counter redraws during a scan
+UI_REFRESH_INTERVAL = 0.2
 
 # --- Main App UI ---
 st.title("🚢 Manual & Drawing Scanner")
@@ -113,18 +98,16 @@ with st.sidebar:
         include_subfolders = st.checkbox("Include subfolders", value=True)
         
         if input_folder and os.path.exists(input_folder):
-            target_path = Path(input_folder)
-            if include_subfolders:
-                all_files = list(target_path.rglob("*"))
-            else:
-                all_files = list(target_path.glob("*"))
-            files_to_scan = [f for f in all_files if f.is_file()]
+            # Lazy walk: nothing is read from disk until a scan starts
+            files_to_scan = iter_files(input_folder, include_subfolders)
     else:
         uploaded_files = st.file_uploader("Upload Manuals/Drawings", type=["pdf", "docx"], accept_multiple_files=True)
         files_to_scan = uploaded_files if uploaded_files else []
 
     scan_docx = st.checkbox("Scan DOCX", value=True)
     enable_debug = st.checkbox("Enable debug logs", value=False)
+    force_rescan = st.checkbox("Force rescan", value=False,
+                               help="Ignore cached results and re-read every file.")
     
     col1, col2 = st.columns(2)
     with col1:
@@ -137,113 +120,113 @@ if stop_btn:
     st.warning("Stop requested. Finishing current file...")
 
 if start_btn:
-    if not files_to_scan:
+    files_iter = iter(files_to_scan)
+    first_file = next(files_iter, None)
+    if first_file is None:
         st.error("Please provide a folder path or upload files first.")
     else:
         st.session_state.scanning = True
         st.session_state.stop_requested = False
         st.session_state.results = []
         
-        total_files = len(files_to_scan)
+        total_files = 0
         
         # LIVE COUNTERS
-        stats_cols = st.columns(6)
-        total_c = stats_cols[0].metric("Total", total_files)
-        processed_c = stats_cols[1].empty()
-        success_c = stats_cols[2].empty()
-        skipped_u = stats_cols[3].empty()
-        skipped_ocr = stats_cols[4].empty()
-        errors_c = stats_cols[5].empty()
-        
+        stats_container = st.empty()
         progress_bar = st.progress(0)
         status_text = st.empty()
         
         counts = {"processed": 0, "success": 0, "unsupported": 0, "ocr_missing": 0, "error": 0}
+        last_ui = time.monotonic()
         type_counts = {}
+        results_by_idx = {}
+
+        # Extraction is CPU-bound, so fan files out to worker processes and
+        # keep this thread free for progress updates. Unchanged local files
+        # are served from the result cache as already-finished futures.
+        # Not a `with` block: its exit waits for every queued file, which would
+        # hang a Streamlit rerun or stop. Drop the queue instead.
+        ex = ProcessPoolExecutor()
+        try:
+            with ScanCache() as cache:
+                futures = {}
+                # Files are submitted as the folder walk yields them, so workers
+                # start on the first ones while the rest of the tree is still read
+                for idx, file_item in enumerate(chain([first_file], files_iter)):
+                    # Handle both Path objects (local) and UploadedFile objects (cloud)
+                    fname = file_item.name
+                    fparent = str(file_item.parent) if hasattr(file_item, "parent") else ""
+                    rel_path = os.path.relpath(file_item, input_folder) if input_folder else fname
+                    key = None
+                    if isinstance(file_item, Path):
+                        source = str(file_item)
+                        try:
+                            key = scan_cache_key(source, scan_docx)
+                        except OSError:
+                            pass
+                    else:
+                        source = file_item.getvalue()
+
+                    hit = cache.get(key) if key is not None and not force_rescan else None
+                    if hit is not None:
+                        outcome, res = hit
+                        fut = Future()
+                        fut.set_result((outcome, {**res, "Relative Path": rel_path}))
+                        futures[fut] = (idx, None)
+                    else:
+                        fut = ex.submit(scan_one, source, fname, fparent, rel_path, scan_docx)
+                        futures[fut] = (idx, key)
+
+                    total_files += 1
+                    now = time.monotonic()
+                    if now - last_ui > UI_REFRESH_INTERVAL:
+                        last_ui = now
+                        status_text.text(f"Found {total_files} files...")
 
-        for idx, file_item in enumerate(files_to_scan):
-            if st.session_state.stop_requested:
-                st.info("Scan stopped by user.")
-                break
-            
-            counts["processed"] += 1
-            
-            # Handle both Path objects (local) and UploadedFile objects (cloud)
-            fname = file_item.name
-            fext = Path(fname).suffix.lower()
-            fparent = str(file_item.parent) if hasattr(file_item, "parent") else ""
-            rel_path = os.path.relpath(file_item, input_folder) if input_folder else fname
-            
-            status_text.text(f"Processing ({counts['processed']}/{total_files}): {fname}")
-            progress_bar.progress(counts["processed"] / total_files)
-            
-            content = ""
-            status = "Unknown"
-            metadata = {}
-            
-            # Use file_item itself as it can be a Path or a File-like object
-            if fext == ".pdf":
-                content, metadata, status = extract_pdf_content(file_item)
-            elif fext == ".docx" and scan_docx:
-                content, status = extract_docx_content(file_item)
-            elif fext == ".doc":
-                content, status = "", "Skipped: .doc requires LibreOffice"
-            else:
-                content, status = "", "Skipped: Unsupported format"
+                render_stats(stats_container, total_files, counts)
 
-            # Post-processing
-            if status == "Success" and not content.strip():
-                status = "Skipped: Scanned/No Text (OCR missing)"
-                counts["ocr_missing"] += 1
-            elif "Skipped" in status:
-                counts["unsupported"] += 1
-            elif "Error" in status:
-                counts["error"] += 1
-            else:
-                counts["success"] += 1
+                for fut in as_completed(futures):
+                    if st.session_state.stop_requested:
+                        for pending in futures:
+                            pending.cancel()
+                        st.info("Scan stopped by user.")
+                        break
 
-            manual_name = identify_manual_name(content, fname, fparent, metadata)
-            doc_type = classify_doc_type(content, fname, fparent)
-            type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-            
-            # Confidence Logic
-            confidence = "Low"
-            clues = []
-            if content.strip():
-                confidence = "Med"
-                clues.append("Text content")
-            if metadata and metadata.get('/Title'):
-                meta_title = str(metadata['/Title']).strip().upper()
-                if meta_title and meta_title in manual_name.upper():
-                    confidence = "High"
-                    clues.append("Metadata match")
-            if "manual" in fname.lower() or (fparent and "manual" in fparent.lower()):
-                clues.append("Keyword clue")
+                    idx, key = futures[fut]
+                    outcome, res = fut.result()
+                    if key is not None:
+                        cache.put(key, (outcome, res))
+                    counts["processed"] += 1
+                    counts[outcome] += 1
+                    type_counts[res["File Type"]] = type_counts.get(res["File Type"], 0) + 1
+                    results_by_idx[idx] = res
 
-            res = {
-                "File Name": fname,
-                "Relative Path": rel_path,
-                "File Type": doc_type,
-                "Extracted Manual/Equipment/System Name": manual_name,
-                "Confidence": confidence,
-                "Clues": ", ".join(clues),
-                "Notes": status
-            }
-            st.session_state.results.append(res)
-            
-            # Update UI Counters
-            processed_c.metric("Processed", counts["processed"])
-            success_c.metric("Success", counts["success"])
-            skipped_u.metric("Unsupported", counts["unsupported"])
-            skipped_ocr.metric("No Text", counts["ocr_missing"])
-            errors_c.metric("Errors", counts["error"])
-            
-            if enable_debug:
-                st.write(f"DEBUG: Scanned {fname} -> {manual_name} ({doc_type})")
+                    fname = res["File Name"]
 
+                    # Update UI Counters (coalesced, every file would flood the websocket)
+                    now = time.monotonic()
+                    if now - last_ui > UI_REFRESH_INTERVAL:
+                        last_ui = now
+                        status_text.text(f"Processing ({counts['processed']}/{total_files}): {fname}")
+                        progress_bar.progress(counts["processed"] / total_files)
+                        render_stats(stats_container, total_files, counts)
+
+                    if enable_debug:
+                        st.write(f"DEBUG: Scanned {fname} -> {res['Extracted Manual/Equipment/System Name']} ({res['File Type']})")
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
+            # Also runs on a rerun or a worker failure: keep the rows finished
+            # so far (in folder order) and re-enable "Start Scan"
+            st.session_state.results = [results_by_idx[i] for i in sorted(results_by_idx)]
             st.session_state.scanning = False
-            st.success("Scan complete!")
-            st.balloons()
+
+        # Final redraw so the counters reflect the last batch (or the stop point)
+        status_text.text(f"Processed {counts['processed']}/{total_files} files")
+        progress_bar.progress(counts["processed"] / total_files)
+        render_stats(stats_container, total_files, counts)
+
+        st.success("Scan complete!")
+        st.balloons()
 
 # --- Results Display ---
 if st.session_state.results:
@@ -254,18 +237,15 @@ if st.session_state.results:
 
     # --- Excel Export ---
     buffer = io.BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
         df.to_excel(writer, index=False, sheet_name='Results')
         
         # Summary Sheet
+        skipped = int(df["Notes"].str.startswith("Skipped").sum())
+        errors = int(df["Notes"].str.startswith("Error").sum())
         summary_data = {
             "Metric": ["Total Files Found", "Successfully Scanned", "Total Skipped", "Errors"],
-            "Value": [
-                len(df),
-                sum(1 for x in st.session_state.results if not any(s in x["Notes"] for s in ["Skipped", "Error"])),
-                sum(1 for x in st.session_state.results if "Skipped" in x["Notes"]),
-                sum(1 for x in st.session_state.results if "Error" in x["Notes"])
-            ]
+            "Value": [len(df), len(df) - skipped - errors, skipped, errors]
         }
         summary_df = pd.DataFrame(summary_data)
         summary_df.to_excel(writer, index=False, sheet_name='Summary', startrow=0)
@@ -9,6 +9,8 @@
 
 import re
 import unicodedata
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
 SYSTEM_KEYWORDS = [
@@ -68,6 +70,30 @@ ANCHOR_WORDS = [
     "AIR-CON", "AIRCON", "PROVISION", "REFRIGERATING",
 ]
 
+# Document type rules in priority order: (regex group, type, keywords).
+# A "manual" keyword always wins, so the drawing groups need no manual guard.
+DOC_TYPE_RULES = [
+    ("manual", "Machinery/System Manual", [
+        "manual", "instruction", "handbook", "guide", "tmm", "operation manual", "maintenance manual",
+    ]),
+    ("capacity", "Capacity Plan / Datasheet", [
+        "capacity plan", "tank capacity", "tank table", "sounding table", "deadweight scale",
+    ]),
+    ("certificate", "Certificate / Report", [
+        "certificate", "report", "test result", "approval", "inclining experiment", "sea trial", "test record",
+    ]),
+    ("drawing", "Drawing", [
+        "drawing", "diagram", "schematic", "blueprint", "arr't", "arrangment", "arrangement", "plan", "details of",
+        "v/d", "v/dwg", "vendor drawing",
+        "equipment list", "v/v list", "valve list", "flowmeter", "plate type cooler", "centrifugal pump",
+        "m.g.p.s", "prevention system", "name and caution plate",
+        "door plan", "insulation plan", "installation of", "lifting beam", "crane",
+        "air-con system", "provision refrigerating plant", "v/d of",
+        "structure", "construction", "body plan", "shell expansion", "deck and stringer", "bulkhead", "frames",
+        "coamings", "fore body",
+    ]),
+]
+
 STAMP_REGEX = re.compile(
     r"(?i)\b("
     r"DATE|REV\.?|DESCRIPTION|OWN|CHKD\.?|APPD\.?|DWN\.?|"
@@ -79,21 +105,110 @@ STAMP_REGEX = re.compile(
 )
 
 ALLCAPS_JUNK_WHITELIST = {"MAIN", "AUX", "E/R", "ICCP", "MGPS", "V/V", "V/D"}
+_SMART_CASE_KEEP = frozenset({"E/R", "ICCP", "MGPS", "M.G.P.S", "V/V", "V/D"})
 VOWELS = set("AEIOU")
 
+# Title prefixes stripped by clean_manual_name (IMPORTANT: DO NOT REMOVE V/D)
+_TITLE_PREFIXES = [
+    r"Manual for", r"Instruction for", r"Technical Manual for",
+    r"Title", r"Ref", r"Technical", r"for",
+    r"Instruction Manual -", r"Final & Instruction Manual for",
+    r"Final Drawings", r"Instruction Manual", r"Technical Specification of",
+    r"TITLE:", r"TITLE",
+    r"DRAWING OF", r"DRAW I NG OF", r"VENDOR DWG OF", r"VENDOR DWG",
+    r"DWG OF", r"VENDOR DRAWING OF", r"VENDOR DRAWING",
+    # ❌ REMOVED: r"V\/D", r"V-D", r"V\sD", r"V\.D"
+]
+
+# ------------------------------------------------------------
+# Precompiled patterns (compiled once at import, not per file)
+# ------------------------------------------------------------
+_WS_RE = re.compile(r"\s+")
+_NULL_TRANS = str.maketrans({"\x00": " "})
+_ALPHA3_RE = re.compile(r"[A-Za-z]{3,}")
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]")
+_EDGE_TRIM_RE = re.compile(r"^[^A-Za-z0-9/&()]+|[^A-Za-z0-9/&()]+$")
+_PREFIX_RE = re.compile(r"^(?:" + "|".join(_TITLE_PREFIXES) + r")[\s:\-._]+", re.IGNORECASE)
+# clean_manual_name converges in 1-3 rounds on real titles; the cap guards
+# against a transform that keeps rewriting its own output
+_CLEAN_MAX_ROUNDS = 8
+
+# _strip_stamp_fragments
+_STAMP_SIGNOFF_RE = re.compile(r"\b(CHKD|APPD|DWN|CHKO)\b\s*\.?\s*(BY)?\s*[:\-]?\s*[A-Z.\s]{0,15}", re.IGNORECASE)
+_STAMP_REV_RE = re.compile(r"\b(OWN|REV\.?|DATE|DESCRIPTION)\b\s*[:\-]?\s*[A-Z0-9.\s]{0,15}", re.IGNORECASE)
+_STAMP_TAIL_RE = re.compile(r"\b(ISSUED\s*FOR|PLAN\s*HISTORY|SUBMITTED\s*TO|APPROVED\s*BY)\b.*", re.IGNORECASE)
+
+# _normalize_title_terms
+_V_D_RE = re.compile(r"\bV\s*[-./]?\s*D\b(?:\s*OF\b)?", re.IGNORECASE)
+_V_D_OF_RE = re.compile(r"\bV\s*/\s*D\b\s*OF\b", re.IGNORECASE)
+_PROV_RE = re.compile(r"\bPROV\.?\b", re.IGNORECASE)
+_REFER_RE = re.compile(r"\bREF(?:ER)?\.?\b", re.IGNORECASE)
+_AIRCON_RE = re.compile(r"\bAIR[\-\s]?CON\b", re.IGNORECASE)
+_ARRT_QUOTE_RE = re.compile(r"\bARR['’]?\s*T\b", re.IGNORECASE)
+_ARRT_RE = re.compile(r"\bARR\s*T\b", re.IGNORECASE)
+_ARRANGMENT_RE = re.compile(r"\bARRANGMENT\b", re.IGNORECASE)
+_E_DASH_R_RE = re.compile(r"\bE\s*-\s*R\b", re.IGNORECASE)
+_E_SPACE_R_RE = re.compile(r"\bE\s+R\b", re.IGNORECASE)
+_E_SLASH_R_RE = re.compile(r"\bE\s*/\s*R\b", re.IGNORECASE)
+_WORK_SHOP_RE = re.compile(r"\bWORK\s+SHOP\b", re.IGNORECASE)
+_AMPERSAND_RE = re.compile(r"\s*&\s*")
+
+# _drop_garbage_tokens
+_PUNCT_ONLY_RE = re.compile(r"[\W_]{2,}")
+_QUOTE_RE = re.compile(r"[\"',`]")
+_COLON_RE = re.compile(r"[:;]{1,}")
+_CANONICAL_TOKENS = {
+    "AND": "and", "OF": "of", "FOR": "for", "IN": "in",
+    "E/R": "E/R", "E-R": "E/R", "V/D": "V/D",
+}
+
+# clean_manual_name
+_TEL_TAIL_RE = re.compile(r"\s*\(?\bT\s?E\s?L\b:?.*", re.IGNORECASE)
+_RATING_TAIL_RE = re.compile(r"\s*\(?\b\d+(?:V|PH|HZ|KW)\b.*", re.IGNORECASE)
+_VD_OF_CASE_RE = re.compile(r"^V/D\s+Of\b", re.IGNORECASE)
+
+# Keyword/anchor scanners: one leftmost-match pass instead of a find() per word
+def _substring_re(words):
+    return re.compile("|".join(map(re.escape, words)))
+
+_SYSTEM_KEYWORDS_SORTED = tuple(sorted(set(SYSTEM_KEYWORDS), key=len, reverse=True))
+_ANCHOR_RE = _substring_re(ANCHOR_WORDS)
+_KEYWORDS_RE = _substring_re(_SYSTEM_KEYWORDS_SORTED)
+_TITLE_HINT_RE = _substring_re(["PLAN", "LIST", "ARRANGEMENT", "INSTALLATION", "DOOR", "INSULATION", "CRANE", "BEAM", "SYSTEM", "PLANT"])
+_TITLE_BLOCK_STOP_RE = _substring_re(["PROJECT NO", "PLAN NO", "DWG NO", "DRAWING NO", "SHEET", "SCALE", "DEPT", "DSME"])
+_TITLE_BLOCK_DONE_RE = _substring_re(["V/D", "E/R", "PLAN", "LIST", "ARRANGEMENT", "SYSTEM", "PLANT"])
+_MERGED_TITLE_RE = _substring_re(["V-D", "V/D", "SPARE", "ARR", "NAME", "VALVE", "EQUIPMENT", "SYSTEM", "PLANT"])
+
+# identify_manual_name
+_DRAWING_PREFIX_RE = re.compile(r"^[A-Z]+\([A-Z]\)-\d+", re.IGNORECASE)
+_DRAWING_PREFIX_STRIP_RE = re.compile(r"^[A-Z]+\([A-Z]\)-\d+\s*", re.IGNORECASE)
+_V_D_OF_FILENAME_RE = re.compile(r"\bV\s*[-./]?\s*D\s*OF\b", re.IGNORECASE)
+_TITLE_LABEL_RE = re.compile(r"\bTITLE\b\s*[:\-]?", re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def _compile_ci(pattern):
+    return re.compile(pattern, re.IGNORECASE)
+
 def extract_with_regex(text, patterns):
     results = {}
     for key, pattern in patterns.items():
-        m = re.search(pattern, text or "", re.IGNORECASE)
+        m = _compile_ci(pattern).search(text or "")
         results[key] = m.group(1).strip() if m else "Unknown"
     return results
 
 def normalize_text(text):
     if not text:
         return ""
-    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("utf-8", errors="ignore")
-    text = text.replace("\x00", " ")
-    return re.sub(r"\s+", " ", text).strip()
+    # NFKD + ASCII fold is a no-op on pure-ASCII text (most PDF/OCR output)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _WS_RE.sub(" ", text.translate(_NULL_TRANS)).strip()
+
+@lru_cache(maxsize=4096)
+def _normalize_name(name):
+    # Memoized: folder names and filenames repeat across sibling files.
+    # Body text goes through normalize_text uncached.
+    return normalize_text(name)
 
 def _alpha_ratio(s: str) -> float:
     if not s:
@@ -101,9 +216,6 @@ def _alpha_ratio(s: str) -> float:
     letters = sum(ch.isalpha() for ch in s)
     return letters / max(len(s), 1)
 
-def _has_vowel(token: str) -> bool:
-    return any(ch in VOWELS for ch in token.upper())
-
 def _looks_like_stamp_or_revision(line_upper: str) -> bool:
     if not line_upper:
         return False
@@ -117,11 +229,11 @@ def _strip_stamp_fragments(s: str) -> str:
     if not s:
         return ""
     s = normalize_text(s)
-    s = re.sub(r"(?i)\b(CHKD|APPD|DWN|CHKO)\b\s*\.?\s*(BY)?\s*[:\-]?\s*[A-Z.\s]{0,15}", " ", s)
-    s = re.sub(r"(?i)\b(OWN|REV\.?|DATE|DESCRIPTION)\b\s*[:\-]?\s*[A-Z0-9.\s]{0,15}", " ", s)
-    s = re.sub(r"(?i)\b(ISSUED\s*FOR|PLAN\s*HISTORY|SUBMITTED\s*TO|APPROVED\s*BY)\b.*", " ", s)
+    s = _STAMP_SIGNOFF_RE.sub(" ", s)
+    s = _STAMP_REV_RE.sub(" ", s)
+    s = _STAMP_TAIL_RE.sub(" ", s)
     s = STAMP_REGEX.sub(" ", s)
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
 def _normalize_title_terms(s: str) -> str:
     if not s:
@@ -130,31 +242,31 @@ def _normalize_title_terms(s: str) -> str:
 
     # ✅ Canonicalize vendor drawing prefix FIRST
     # "V-D OF", "V D OF", "V.D OF", "V / D OF" -> "V/D of"
-    s = re.sub(r"(?i)\bV\s*[-./]?\s*D\s*(?:OF)?\b", "V/D of", s)
-    s = re.sub(r"(?i)\bV\s*/\s*D\b\s*OF\b", "V/D of", s)
+    s = _V_D_RE.sub("V/D of", s)
+    s = _V_D_OF_RE.sub("V/D of", s)
 
     # Expand common abbreviations safely
-    s = re.sub(r"(?i)\bPROV\.?\b", "Provision", s)
-    s = re.sub(r"(?i)\bREF(?:ER)?\.?\b", "Refrigerating", s)  # REF / REFER -> Refrigerating
-    s = re.sub(r"(?i)\bAIR[\-\s]?CON\b", "Air-Con", s)
+    s = _PROV_RE.sub("Provision", s)
+    s = _REFER_RE.sub("Refrigerating", s)  # REF / REFER -> Refrigerating
+    s = _AIRCON_RE.sub("Air-Con", s)
 
     # ARR'T / ARR T / ARRANGMENT -> ARRANGEMENT
-    s = re.sub(r"(?i)\bARR['’]?\s*T\b", "ARRANGEMENT", s)
-    s = re.sub(r"(?i)\bARR\s*T\b", "ARRANGEMENT", s)
-    s = re.sub(r"(?i)\bARRANGMENT\b", "ARRANGEMENT", s)
+    s = _ARRT_QUOTE_RE.sub("ARRANGEMENT", s)
+    s = _ARRT_RE.sub("ARRANGEMENT", s)
+    s = _ARRANGMENT_RE.sub("ARRANGEMENT", s)
 
     # E-R / E R / E/R -> E/R
-    s = re.sub(r"(?i)\bE\s*-\s*R\b", "E/R", s)
-    s = re.sub(r"(?i)\bE\s+R\b", "E/R", s)
-    s = re.sub(r"(?i)\bE\s*/\s*R\b", "E/R", s)
+    s = _E_DASH_R_RE.sub("E/R", s)
+    s = _E_SPACE_R_RE.sub("E/R", s)
+    s = _E_SLASH_R_RE.sub("E/R", s)
 
     # WORK SHOP -> WORKSHOP
-    s = re.sub(r"(?i)\bWORK\s+SHOP\b", "WORKSHOP", s)
+    s = _WORK_SHOP_RE.sub("WORKSHOP", s)
 
     # & -> AND
-    s = re.sub(r"\s*&\s*", " AND ", s)
+    s = _AMPERSAND_RE.sub(" AND ", s)
 
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
 def _slice_from_first_anchor(s: str) -> str:
     if not s:
@@ -165,16 +277,11 @@ def _slice_from_first_anchor(s: str) -> str:
     if s.upper().startswith("V/D OF"):
         return s
 
-    up = s.upper()
-    best_idx = None
-    for w in ANCHOR_WORDS:
-        idx = up.find(w)
-        if idx != -1:
-            best_idx = idx if best_idx is None else min(best_idx, idx)
-
-    if best_idx is None:
+    m = _ANCHOR_RE.search(s.upper())
+    if not m:
         return s
 
+    best_idx = m.start()
     head = s[:best_idx]
     if _alpha_ratio(head) < 0.40 or len(head) > 12:
         return s[best_idx:].strip()
@@ -184,29 +291,22 @@ def _drop_garbage_tokens(s: str) -> str:
     if not s:
         return ""
     tokens = []
-    for tok in s.split():
-        t = tok.strip()
+    for t in s.split():
         tu = t.upper()
 
-        if tu in {"AND", "OF", "FOR", "IN"}:
-            tokens.append(tu.lower() if tu in {"OF", "FOR", "IN"} else "and")
-            continue
-
-        if tu in {"E/R", "E-R"}:
-            tokens.append("E/R")
+        canon = _CANONICAL_TOKENS.get(tu)
+        if canon:
+            tokens.append(canon)
             continue
 
-        if tu == "V/D":
-            tokens.append("V/D")
+        if _PUNCT_ONLY_RE.fullmatch(t):
             continue
 
-        if re.fullmatch(r"[\W_]{2,}", t):
+        if len(t) <= 2 and tu != "ER":
             continue
 
-        if len(t) <= 2 and tu not in {"ER"}:
-            continue
-
-        if re.search(r"[\"',`]", t) and _alpha_ratio(t) < 0.70:
+        ratio = _alpha_ratio(t)
+        if ratio < 0.70 and _QUOTE_RE.search(t):
             continue
 
         if t.isupper() and 3 <= len(t) <= 4 and tu not in ALLCAPS_JUNK_WHITELIST:
@@ -214,18 +314,19 @@ def _drop_garbage_tokens(s: str) -> str:
             if tu not in {"PLAN", "ROOM"}:
                 continue
 
-        if len(t) >= 3 and t.isalpha() and (not _has_vowel(t)) and tu not in ALLCAPS_JUNK_WHITELIST:
+        if len(t) >= 3 and t.isalpha() and VOWELS.isdisjoint(tu) and tu not in ALLCAPS_JUNK_WHITELIST:
             continue
 
-        if _alpha_ratio(t) < 0.25 and not re.search(r"[A-Za-z]{3,}", t):
+        if ratio < 0.25 and not _ALPHA3_RE.search(t):
             continue
 
-        if re.search(r"[:;]{1,}", t) and _alpha_ratio(t) < 0.45:
+        if ratio < 0.45 and _COLON_RE.search(t):
             continue
 
         tokens.append(t)
 
-    return re.sub(r"\s+", " ", " ".join(tokens)).strip()
+    # split() tokens carry no whitespace, so the join is already normalized
+    return " ".join(tokens)
 
 def _is_meaningful_title(s: str) -> bool:
     if not s:
@@ -236,85 +337,76 @@ def _is_meaningful_title(s: str) -> bool:
         return False
     if up.startswith("V/D OF"):
         return True
-    if any(k in up for k in SYSTEM_KEYWORDS):
+    if _KEYWORDS_RE.search(up):
         return True
-    if any(x in up for x in ["PLAN", "LIST", "ARRANGEMENT", "INSTALLATION", "DOOR", "INSULATION", "CRANE", "BEAM", "SYSTEM", "PLANT"]):
+    if _TITLE_HINT_RE.search(up):
         return True
     return False
 
+def _smart_title(s: str) -> str:
+    # Smart casing (keeps V/D, E/R, ICCP)
+    out = []
+    for w in s.split():
+        wu = w.upper()
+        if wu in _SMART_CASE_KEEP:
+            out.append(wu)
+        elif w.isupper() and len(w) <= 4:
+            out.append(w)
+        else:
+            out.append(w.capitalize())
+    # Fix "V/D Of" to "V/D of"
+    return _VD_OF_CASE_RE.sub("V/D of", " ".join(out))
+
+@lru_cache(maxsize=2048)
 def clean_manual_name(name: str) -> str:
+    # Memoized: the TITLE-block and keyword scans retry overlapping candidates
     if not name:
         return ""
 
     name = _normalize_title_terms(name)
 
-    while True:
+    for _ in range(_CLEAN_MAX_ROUNDS):
         prev = name
 
-        name = re.sub(r"^[^A-Za-z0-9/&()]+|[^A-Za-z0-9/&()]+$", "", name).strip()
+        name = _EDGE_TRIM_RE.sub("", name).strip()
         name = _slice_from_first_anchor(name)
         name = _strip_stamp_fragments(name)
         name = _drop_garbage_tokens(name)
         name = _normalize_title_terms(name)
 
         # ✅ prefix removal (IMPORTANT: DO NOT REMOVE V/D)
-        prefixes = [
-            r"Manual for", r"Instruction for", r"Technical Manual for",
-            r"Title", r"Ref", r"Technical", r"for",
-            r"Instruction Manual -", r"Final & Instruction Manual for",
-            r"Final Drawings", r"Instruction Manual", r"Technical Specification of",
-            r"TITLE:", r"TITLE",
-            r"DRAWING OF", r"DRAW I NG OF", r"VENDOR DWG OF", r"VENDOR DWG",
-            r"DWG OF", r"VENDOR DRAWING OF", r"VENDOR DRAWING",
-            # ❌ REMOVED: r"V\/D", r"V-D", r"V\sD", r"V\.D"
-        ]
-        pattern = r"^(?:" + "|".join(prefixes) + r")[\s:\-._]+"
-        name = re.sub(pattern, "", name, flags=re.IGNORECASE).strip()
+        name = _PREFIX_RE.sub("", name).strip()
 
         if name == prev:
-            break
-
-    name = re.sub(r"\s*\(?\bT\s?E\s?L\b:?.*", "", name, flags=re.IGNORECASE).strip()
-    name = re.sub(r"\s*\(?\b\d+(?:V|PH|HZ|KW)\b.*", "", name, flags=re.IGNORECASE).strip()
+            # Cutting a TEL/rating tail can leave e.g. "No:" at the end, so go
+            # round again until the tails are gone too
+            name = _TEL_TAIL_RE.sub("", name).strip()
+            name = _RATING_TAIL_RE.sub("", name).strip()
+            name = _EDGE_TRIM_RE.sub("", name).strip()
+            if name == prev:
+                break
 
-    name = re.sub(r"^[^A-Za-z0-9/&()]+|[^A-Za-z0-9/&()]+$", "", name).strip()
-    name = re.sub(r"\s+", " ", name).strip()
+    name = _WS_RE.sub(" ", name).strip()
 
-    alnum = re.sub(r"[^a-zA-Z0-9]", "", name)
+    alnum = _NON_ALNUM_RE.sub("", name)
     if len(alnum) < 4 or name.upper() in {"TITLE", "MANUAL", "REF", "PROJECT", "DWG", "PLAN"}:
         return ""
 
-    # Smart casing (keeps V/D, E/R, ICCP)
-    def smart_title(s: str) -> str:
-        out = []
-        for w in s.split():
-            wu = w.upper()
-            if wu in {"E/R", "ICCP", "MGPS", "M.G.P.S", "V/V", "V/D"}:
-                out.append(wu)
-            elif w.isupper() and len(w) <= 4:
-                out.append(w)
-            else:
-                out.append(w.capitalize())
-        # Fix "V/D Of" to "V/D of"
-        res = " ".join(out)
-        res = re.sub(r"(?i)^V/D\s+Of\b", "V/D of", res)
-        return res
-
-    return smart_title(name)
+    return _smart_title(name)
 
 def identify_manual_name(text, filename, folder_path="", metadata=None):
     text = text or ""
-    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-    lines = lines[:900]
+    # Strip each line once and stop collecting after 900 non-empty lines
+    lines = list(islice((stripped for ln in text.split("\n") if (stripped := ln.strip())), 900))
 
     filename_only = Path(filename).stem if filename else ""
     folder_name = Path(folder_path).name if folder_path else ""
 
     # Prefer filename for M(A)-xx, M(V)-xx, A(V)-xx drawings
-    is_drawing_prefix = bool(re.match(r"(?i)^[A-Z]+\([A-Z]\)-\d+", filename_only or ""))
-    fn_clean = re.sub(r"(?i)^[A-Z]+\([A-Z]\)-\d+\s*", "", filename_only).strip()
+    is_drawing_prefix = bool(_DRAWING_PREFIX_RE.match(filename_only or ""))
+    fn_clean = _DRAWING_PREFIX_STRIP_RE.sub("", filename_only).strip()
     fn_clean = fn_clean.replace("_", " ").replace("-", " ")
-    fn_clean = re.sub(r"\s+", " ", fn_clean).strip()
+    fn_clean = _WS_RE.sub(" ", fn_clean).strip()
 
     if is_drawing_prefix:
         words = [w for w in fn_clean.split() if len(w) >= 2]
@@ -324,7 +416,7 @@ def identify_manual_name(text, filename, folder_path="", metadata=None):
                 return cleaned
 
     # ✅ Special: Vendor Drawing filenames A(V)-xx ... V-D OF ...
-    if re.search(r"(?i)\bV\s*[-./]?\s*D\s*OF\b", fn_clean):
+    if _V_D_OF_FILENAME_RE.search(fn_clean):
         forced = _normalize_title_terms(fn_clean)
         cleaned = clean_manual_name(forced)
         if cleaned:
@@ -332,7 +424,7 @@ def identify_manual_name(text, filename, folder_path="", metadata=None):
 
     # TITLE block extraction
     for i, line in enumerate(lines[:320]):
-        m = re.search(r"\bTITLE\b\s*[:\-]?", line, flags=re.IGNORECASE)
+        m = _TITLE_LABEL_RE.search(line)
         if not m:
             continue
         chunk = [line[m.start():]]
@@ -345,13 +437,13 @@ def identify_manual_name(text, filename, folder_path="", metadata=None):
                 continue
             if _looks_like_stamp_or_revision(nxt_up):
                 break
-            if any(k in nxt_up for k in ["PROJECT NO", "PLAN NO", "DWG NO", "DRAWING NO", "SHEET", "SCALE", "DEPT", "DSME"]):
+            if _TITLE_BLOCK_STOP_RE.search(nxt_up):
                 break
-            if _alpha_ratio(nxt) < 0.20 and not re.search(r"[A-Za-z]{3,}", nxt):
+            if _alpha_ratio(nxt) < 0.20 and not _ALPHA3_RE.search(nxt):
                 continue
             chunk.append(nxt)
             joined = " ".join(chunk)
-            if len(joined) > 40 and any(x in joined.upper() for x in ["V/D", "E/R", "PLAN", "LIST", "ARRANGEMENT", "SYSTEM", "PLANT"]):
+            if len(joined) > 40 and _TITLE_BLOCK_DONE_RE.search(joined.upper()):
                 break
 
         cleaned = clean_manual_name(" ".join(chunk))
@@ -361,43 +453,40 @@ def identify_manual_name(text, filename, folder_path="", metadata=None):
     # merged OCR: "... TITLE ... <title>"
     for line in lines[:420]:
         up = line.upper()
-        if "TITLE" in up and any(k in up for k in ["V-D", "V/D", "SPARE", "ARR", "NAME", "VALVE", "EQUIPMENT", "SYSTEM", "PLANT"]):
+        if "TITLE" in up and _MERGED_TITLE_RE.search(up):
             candidate = line[up.find("TITLE"):]
             cleaned = clean_manual_name(candidate)
             if cleaned and _is_meaningful_title(cleaned):
                 return cleaned
 
     # keyword scan
-    keywords = sorted(set(SYSTEM_KEYWORDS), key=len, reverse=True)
     for i, line in enumerate(lines[:550]):
         up = line.upper()
         if _looks_like_stamp_or_revision(up):
             continue
-        if _alpha_ratio(line) < 0.18 and not re.search(r"[A-Za-z]{3,}", line):
+        if _alpha_ratio(line) < 0.18 and not _ALPHA3_RE.search(line):
             continue
-        for kw in keywords:
-            if kw in up and len(line) < 260:
-                candidate = line
-                for j in range(1, 12):
-                    if i + j >= len(lines):
-                        break
-                    nxt = lines[i + j].strip()
-                    nxt_up = nxt.upper()
-                    if _looks_like_stamp_or_revision(nxt_up):
-                        break
-                    if _alpha_ratio(nxt) < 0.18 and not re.search(r"[A-Za-z]{3,}", nxt):
-                        continue
-                    candidate = f"{candidate} {nxt}"
-                    if len(candidate) > 360:
-                        break
-                cleaned = clean_manual_name(candidate)
-                if cleaned and _is_meaningful_title(cleaned):
-                    return cleaned
+        if len(line) < 260 and _KEYWORDS_RE.search(up):
+            candidate = line
+            for j in range(1, 12):
+                if i + j >= len(lines):
+                    break
+                nxt = lines[i + j].strip()
+                nxt_up = nxt.upper()
+                if _looks_like_stamp_or_revision(nxt_up):
+                    break
+                if _alpha_ratio(nxt) < 0.18 and not _ALPHA3_RE.search(nxt):
+                    continue
+                candidate = f"{candidate} {nxt}"
+                if len(candidate) > 360:
+                    break
+            cleaned = clean_manual_name(candidate)
+            if cleaned and _is_meaningful_title(cleaned):
+                return cleaned
 
     # label patterns
     for label in ["Document Title", "Engine Type", "Ship No", "Vessel Name"]:
-        pat = LABEL_PATTERNS[label]
-        found = re.search(pat, text, re.IGNORECASE)
+        found = _compile_ci(LABEL_PATTERNS[label]).search(text)
         if found:
             cleaned = clean_manual_name(found.group(1).strip())
             if cleaned and _is_meaningful_title(cleaned):
@@ -415,32 +504,24 @@ def identify_manual_name(text, filename, folder_path="", metadata=None):
     cleaned = clean_manual_name(combo)
     return cleaned if cleaned else ""
 
-def classify_doc_type(text, filename, folder_path=""):
-    combined = (normalize_text(text) + " " + normalize_text(filename) + " " + normalize_text(Path(folder_path).name)).lower()
-
-    if any(k in combined for k in ["manual", "instruction", "handbook", "guide", "tmm", "operation manual", "maintenance manual"]):
-        return "Machinery/System Manual"
-
-    if any(k in combined for k in ["capacity plan", "tank capacity", "tank table", "sounding table", "deadweight scale"]):
-        return "Capacity Plan / Datasheet"
-
-    if any(k in combined for k in ["certificate", "report", "test result", "approval", "inclining experiment", "sea trial", "test record"]):
-        return "Certificate / Report"
+def _match_doc_type(s):
+    # Rules are in priority order, so the first rule with any keyword hit wins
+    for _, doc_type, keywords in DOC_TYPE_RULES:
+        if any(k in s for k in keywords):
+            return doc_type
+    return None
 
-    if any(k in combined for k in ["drawing", "diagram", "schematic", "blueprint", "arr't", "arrangment", "arrangement", "plan", "details of", "v/d", "v/dwg", "vendor drawing"]):
-        if "manual" not in combined:
-            return "Drawing"
-
-    if any(k in combined for k in [
-        "equipment list", "v/v list", "valve list", "flowmeter", "plate type cooler", "centrifugal pump",
-        "m.g.p.s", "prevention system", "name and caution plate",
-        "door plan", "insulation plan", "installation of", "lifting beam", "crane",
-        "air-con system", "provision refrigerating plant", "vendor drawing", "v/d of"
-    ]):
-        if "manual" not in combined:
-            return "Drawing"
-
-    if any(k in combined for k in ["structure", "construction", "body plan", "shell expansion", "deck and stringer", "bulkhead", "frames", "coamings", "fore body"]):
-        return "Drawing"
+def classify_doc_type(text, filename, folder_path=""):
+    # Cheap check first: a manual keyword in the filename/folder outranks
+    # anything the body could add, so skip normalizing the body text
+    short = (_normalize_name(filename) + " " + _normalize_name(Path(folder_path).name)).lower()
+    _, manual_type, manual_keywords = DOC_TYPE_RULES[0]
+    if any(k in short for k in manual_keywords):
+        return manual_type
+
+    combined = normalize_text(text).lower() + " " + short
+    doc_type = _match_doc_type(combined)
+    if doc_type is not None:
+        return doc_type
 
     return "Unknown"
\ No newline at end of file
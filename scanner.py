@@ -0,0 +1,176 @@
+"""
+Per-file scan worker for the Manual/Drawing Scanner.
+Kept free of Streamlit so it can run inside ProcessPoolExecutor workers.
+"""
+
+import io
+import json
+import os
+import sqlite3
+from pathlib import Path
+import pymupdf
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+from extraction_utils import identify_manual_name, classify_doc_type
+
+# Results of earlier folder scans, persisted across reruns (see scan_cache_key)
+SCAN_CACHE_PATH = ".manualscan_cache.sqlite3"
+# Bump whenever extraction or naming rules change so cached rows stop matching
+SCAN_CACHE_VERSION = 1
+
+# --- File Discovery ---
+def iter_files(root, recursive=True):
+    """Yield files under `root` as the directory walk finds them (no full listing in memory)."""
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield Path(entry.path)
+                except OSError:
+                    continue
+
+# --- Extraction Logic ---
+def extract_pdf_content(file_path):
+    """
+    Extract text and metadata from the first two pages of a PDF.
+    PyMuPDF parses pages lazily, so later pages are never interpreted.
+    """
+    try:
+        if isinstance(file_path, (bytes, bytearray)):
+            doc = pymupdf.open(stream=file_path, filetype="pdf")
+        elif isinstance(file_path, (str, Path)):
+            doc = pymupdf.open(file_path)
+        else:
+            doc = pymupdf.open(stream=file_path.read(), filetype="pdf")
+        with doc:
+            pages = [doc.load_page(i).get_text() for i in range(min(2, doc.page_count))]
+            # PyMuPDF uses bare keys ("title", "modDate"); keep the pypdf
+            # "/Title" shape that identify_manual_name and scan_one expect.
+            metadata = {f"/{k[:1].upper()}{k[1:]}": v for k, v in (doc.metadata or {}).items() if v}
+        return "\n".join(pages), metadata, "Success"
+    except Exception as e:
+        return "", {}, f"Error: {str(e)}"
+
+def extract_docx_content(file_path):
+    """Extract text from the first two pages of a DOCX (approx 50 paras)."""
+    if Document is None:
+        return "", {}, "Skipped: python-docx not installed"
+    try:
+        if isinstance(file_path, bytes):
+            file_path = io.BytesIO(file_path)
+        doc = Document(file_path)
+        text = "\n".join([para.text for para in doc.paragraphs[:50]])
+        return text, {}, "Success"
+    except Exception as e:
+        return "", {}, f"Error: {str(e)}"
+
+def _skipped(reason):
+    return lambda file_path: ("", {}, f"Skipped: {reason}")
+
+# Extension -> extractor; every extractor returns (text, metadata, status)
+EXTRACTORS = {
+    ".pdf": extract_pdf_content,
+    ".docx": extract_docx_content,
+    ".doc": _skipped(".doc requires LibreOffice"),
+}
+_UNSUPPORTED = _skipped("Unsupported format")
+
+# --- Result Cache ---
+def scan_cache_key(path_str, scan_docx):
+    """Cache key for a local file; any edit changes its mtime or size and misses."""
+    stat = os.stat(path_str)
+    return repr((SCAN_CACHE_VERSION, path_str, stat.st_mtime_ns, stat.st_size, bool(scan_docx)))
+
+class ScanCache:
+    """
+    (outcome, row) results keyed by scan_cache_key, shared by all sessions.
+    Streamlit sessions are threads of one process, so each scan opens its own
+    connection and leaves the locking to SQLite.
+    """
+    def __init__(self, path=SCAN_CACHE_PATH):
+        # Autocommit: a long scan never holds the write lock between files
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def get(self, key):
+        row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- Worker ---
+def scan_one(source, fname, fparent, rel_path, scan_docx):
+    """
+    Scan a single file and build its result row.
+    `source` is a path string (local folder) or the raw bytes of an uploaded file.
+    Returns (outcome, row) where outcome is one of the live counter keys.
+    """
+    fext = Path(fname).suffix.lower()
+    extractor = EXTRACTORS.get(fext, _UNSUPPORTED)
+    if fext == ".docx" and not scan_docx:
+        extractor = _UNSUPPORTED
+    content, metadata, status = extractor(source)
+
+    # Post-processing
+    if status == "Success" and not content.strip():
+        status = "Skipped: Scanned/No Text (OCR missing)"
+        outcome = "ocr_missing"
+    elif "Skipped" in status:
+        outcome = "unsupported"
+    elif "Error" in status:
+        outcome = "error"
+    else:
+        outcome = "success"
+
+    manual_name = identify_manual_name(content, fname, fparent, metadata)
+    doc_type = classify_doc_type(content, fname, fparent)
+
+    # Confidence Logic
+    confidence = "Low"
+    clues = []
+    if content.strip():
+        confidence = "Med"
+        clues.append("Text content")
+    if metadata and metadata.get('/Title'):
+        meta_title = str(metadata['/Title']).strip().upper()
+        if meta_title and meta_title in manual_name.upper():
+            confidence = "High"
+            clues.append("Metadata match")
+    if "manual" in fname.lower() or (fparent and "manual" in fparent.lower()):
+        clues.append("Keyword clue")
+
+    row = {
+        "File Name": fname,
+        "Relative Path": rel_path,
+        "File Type": doc_type,
+        "Extracted Manual/Equipment/System Name": manual_name,
+        "Confidence": confidence,
+        "Clues": ", ".join(clues),
+        "Notes": status
+    }
+    return outcome, row
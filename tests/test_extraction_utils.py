@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from extraction_utils import clean_manual_name
+
+# Outputs of the original fixed-point loop for the same inputs
+BASELINE_CASES = [
+    ("ROOM AIR CON E R M.G.P.S No: (TEL: 123)", "ROOM Air-con E/R M.G.P.S"),
+    ("PLAN REV. -- No: :: E R", ""),
+    ("ARRANGEMENT VENDOR DRAWING 123 No: SPARE PARTS REF", "Arrangement Vendor Spare Parts Refrigerating"),
+    ("TITLE: Manual for M.G.P.S FLOWMETER", "Flowmeter"),
+    ("VENDOR DRAWING TEL: 123 Title: Manual for M.G.P.S FLOWMETER", "Flowmeter"),
+    ("V/D OF ENGINE ROOM PLAN", "V/D of Engine ROOM PLAN"),
+]
+
+TOKENS = [
+    "No:", "(TEL: 123)", "TEL: 5", "::", "--", "123", "440V", "REV.", "Title:", "Manual for",
+    "VENDOR DRAWING", "DRAWING OF", "V/D", "V-D", "OF", "of", "ARR'T", "ARRANGEMENT", "AIR CON",
+    "E R", "ROOM", "M.G.P.S", "REF", "PLAN", "SPARE PARTS", "CHKD BY", "ISSUED FOR", "Main Engine",
+    "Fire Fighting", "pump", "handbook", "Ship No: 1234", "x",
+]
+
+
+@pytest.mark.parametrize("raw, expected", BASELINE_CASES)
+def test_clean_manual_name_matches_baseline(raw, expected):
+    assert clean_manual_name(raw) == expected
+
+
+def test_clean_manual_name_drops_no_left_by_tel_tail():
+    assert clean_manual_name("ARR'T of No: (TEL: 123) Manual for ARRANGEMENT") == "Arrangement Of"
+
+
+def test_clean_manual_name_is_idempotent():
+    rng = random.Random(0)
+    names = [raw for raw, _ in BASELINE_CASES]
+    names += [" ".join(rng.choices(TOKENS, k=rng.randint(1, 10))) for _ in range(5000)]
+    for raw in names:
+        once = clean_manual_name(raw)
+        assert clean_manual_name(once) == once, raw
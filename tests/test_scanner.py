@@ -0,0 +1,37 @@
+import threading
+
+import scanner
+from scanner import ScanCache, scan_cache_key
+
+
+def test_scan_cache_key_changes_with_version(tmp_path, monkeypatch):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    key = scan_cache_key(str(pdf), True)
+    monkeypatch.setattr(scanner, "SCAN_CACHE_VERSION", scanner.SCAN_CACHE_VERSION + 1)
+    assert scan_cache_key(str(pdf), True) != key
+
+
+def test_scan_cache_shared_by_concurrent_sessions(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    errors = []
+
+    def session(n):
+        try:
+            with ScanCache(path) as cache:
+                for i in range(200):
+                    cache.put(f"{n}-{i}", ("success", {"File Name": f"f{i}.pdf"}))
+                    assert cache.get(f"{n}-{i}") == ["success", {"File Name": f"f{i}.pdf"}]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with ScanCache(path) as cache:
+        assert cache.get("7-199") == ["success", {"File Name": "f199.pdf"}]
+        assert cache.get("missing") is None